@@ -10,23 +10,29 @@ Description: Downloads YouTube playlists/videos as MP4 or MP3 with progress trac
 # Standard library imports
 import os
 import sys
+import json
 import time
-import multiprocessing
+import itertools
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Empty, Full, Queue, SimpleQueue
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Third-party imports
 import yt_dlp
 import FreeSimpleGUI as sg
 from yt_dlp import DownloadCancelled
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
 
 # Fix PATH for frozen Windows executables to include ffmpeg
 if sys.platform == 'win32' and getattr(sys, 'frozen', False):
     os.environ['PATH'] = os.path.dirname(sys.executable) + os.pathsep + os.environ['PATH']
 
+@lru_cache(maxsize=1)
 def get_ffmpeg_path():
     """
-    Locate and validate ffmpeg executable path
+    Locate and validate ffmpeg executable path, cached for the process lifetime
     Returns:
         str: Full path to ffmpeg.exe
     Raises:
@@ -50,6 +56,50 @@ def get_ffmpeg_path():
 # Configuration file path
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), 'petice_config.txt')
 
+def save_config(base_folder, create_subfolder):
+    """
+    Atomically write settings to the configuration file as JSON
+    Args:
+        base_folder (str): Root download directory
+        create_subfolder (bool): Whether downloads go to a 'Petice Downloads' subfolder
+    """
+    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+    tmp_path = CONFIG_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'base_folder': base_folder, 'create_subfolder': create_subfolder}, f)
+    os.replace(tmp_path, CONFIG_PATH)  # Never leaves a half-written config behind
+
+def load_config():
+    """
+    Load settings, creating defaults or migrating the legacy two-line format
+    Returns:
+        tuple: (base_folder, create_subfolder)
+    """
+    if not os.path.exists(CONFIG_PATH):
+        base_folder = os.path.join(os.path.expanduser("~"), "Desktop", "Petice Downloads")
+        save_config(base_folder, True)
+        return base_folder, True
+
+    base_folder = os.path.join(os.path.expanduser("~"), "Desktop")
+    create_subfolder = True
+    try:
+        with open(CONFIG_PATH, 'r') as f:
+            content = f.read()
+        try:
+            config = json.loads(content)
+            return config['base_folder'], config['create_subfolder']
+        except ValueError:
+            # Legacy format: base folder and subfolder flag on separate lines
+            lines = content.splitlines()
+            if len(lines) >= 1:
+                base_folder = lines[0].strip()
+            if len(lines) >= 2:
+                create_subfolder = lines[1].strip().lower() == 'true'
+            save_config(base_folder, create_subfolder)
+    except Exception as e:
+        pass
+    return base_folder, create_subfolder
+
 class ConsoleLogger:
     """
     Custom logger class for yt-dlp to capture different message types, only for dev purposes.
@@ -66,8 +116,49 @@ COMMON_OPTS = {
     'quiet': True,          # Suppress console output
     'no_warnings': True,    # Ignore YouTube warnings
     'logger': False,        # Disable default logging
+    # Faster LAME algorithm for mp3 extraction (bitrate stays 256k), unused for mp4.
+    # Keyed by yt-dlp's ExtractAudio postprocessor name, applied to the ffmpeg output file
+    'postprocessor_args': {'extractaudio+ffmpeg_o': ['-compression_level', '5']},
+}
+
+# Format specific options for yt-dlp downloader
+MP4_OPTS = {
+    'format': 'bv*[ext=mp4]+ba[ext=m4a]/b[ext=mp4]',
+    # Prefer H.264/AAC and pre-muxed streams at equal resolution so no ffmpeg merge is needed
+    'format_sort': ['res', 'vcodec:avc', 'acodec:aac'],
+    'merge_output_format': 'mp4',
+}
+MP3_OPTS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '256',
+    }],
 }
 
+# Concurrent download limits, downloads are I/O bound so the default scales past the core count
+MAX_CONCURRENT = 32       # Soft cap on simultaneous downloads, also the worker pool size
+DEFAULT_CONCURRENT = min(MAX_CONCURRENT, (os.cpu_count() or 4) * 4)  # Default simultaneous downloads
+
+# Progress labels "0%".."100%", built once instead of formatted on every redraw
+PERCENT_LABELS = tuple(f"{i}%" for i in range(101))
+
+# Status codes sent with -STATUS- messages and their text colours
+STATUS_INFO, STATUS_DONE, STATUS_ERROR, STATUS_CANCEL = range(4)
+STATUS_COLORS = {
+    STATUS_INFO: "white",
+    STATUS_DONE: "#7BFF47",
+    STATUS_ERROR: "red",
+    STATUS_CANCEL: "red",
+}
+
+# Long-lived pool shared by all concurrent playlist downloads
+_download_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT, thread_name_prefix='petice-dl')
+
+# Translation table replacing characters invalid in filenames
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
 def sanitize_filename(name):
     """
     Clean filenames to be filesystem-safe
@@ -76,11 +167,19 @@ def sanitize_filename(name):
     Returns:
         str: Sanitized filename
     """
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    name = name.strip().rstrip('.')  # Remove trailing dots
-    return name
+    return name.translate(_SANITIZE_TABLE).strip().rstrip('.')  # Remove trailing dots
+
+# Options for metadata-only playlist extraction
+INFO_OPTS = {
+    'extract_flat': True,     # Get playlist structure without full video data
+    'skip_download': True,    # No media download
+    'quiet': True,
+    'no_warnings': True,
+}
+
+# Shared pool for metadata fetches, each worker thread keeps its own YoutubeDL
+_info_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='petice-info')
+_info_local = threading.local()
 
 def get_playlist_info(url):
     """
@@ -92,51 +191,193 @@ def get_playlist_info(url):
     """
     for _ in range(3):  # Retry up to 3 times
         try:
-            opts = {
-                'extract_flat': True,     # Get playlist structure without full video data
-                'skip_download': True,    # No media download
-                'quiet': True,
-                'no_warnings': True,
+            ydl = getattr(_info_local, 'ydl', None)
+            if ydl is None:
+                ydl = _info_local.ydl = yt_dlp.YoutubeDL(INFO_OPTS)
+            info = ydl.extract_info(url, download=False)
+            entries = info.get('entries', []) if info else []
+            return {
+                'title': sanitize_filename(info.get('title', url)),
+                'url': url,
+                'total': len(entries) or 1,  # Handle single videos
+                'entries': entries if entries else [info]
             }
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                entries = info.get('entries', []) if info else []
-                return {
-                    'title': sanitize_filename(info.get('title', url)),
-                    'url': url,
-                    'total': len(entries) or 1,  # Handle single videos
-                    'entries': entries if entries else [info]
-                }
         except Exception as e:
             time.sleep(1)
     return {'title': sanitize_filename(url), 'url': url, 'total': 0, 'entries': []}
 
-def download_process(queue, playlist_info, format_choice, cancel_event, base_folder):
+def build_download_opts(format_choice, playlist_folder):
+    """
+    Assemble yt-dlp options for downloading a playlist
+    Args:
+        format_choice (str): 'mp4' or 'mp3'
+        playlist_folder (str): Output directory for the playlist
+    Returns:
+        dict: Options for yt_dlp.YoutubeDL
+    """
+    return {
+        **COMMON_OPTS,
+        'ffmpeg_location': get_ffmpeg_path(),
+        'outtmpl': os.path.join(playlist_folder, '%(title)s.%(ext)s'),
+        **(MP4_OPTS if format_choice == "mp4" else MP3_OPTS),
+    }
+
+def get_video_url(video):
+    """
+    Build the watch URL for a playlist entry
+    Args:
+        video (dict): Flat playlist entry or video info
+    Returns:
+        str: Video URL
+    """
+    video_id = video.get("id", "")
+    return f"https://www.youtube.com/watch?v={video_id}" if video_id else video.get("url", "")
+
+def create_playlist_folder(base_folder, title):
+    """
+    Create a new folder for a playlist, adding a numeric suffix on name clashes
+    Args:
+        base_folder (str): Root download directory
+        title (str): Sanitized playlist title
+    Returns:
+        str: Path of the created folder
+    """
+    original_folder = os.path.join(base_folder, title)
+
+    # List the base folder once instead of probing every suffix on disk
+    try:
+        with os.scandir(base_folder) as it:
+            existing = {entry.name for entry in it}
+    except FileNotFoundError:
+        existing = set()
+
+    suffix = 0
+    if title in existing:
+        suffix = 1
+        while f"{title}_{suffix}" in existing:
+            suffix += 1
+
+    while True:
+        candidate = original_folder if suffix == 0 else f"{original_folder}_{suffix}"
+        try:
+            os.makedirs(candidate)  # Atomic check-and-create
+            return candidate
+        except FileExistsError:
+            suffix += 1
+
+def make_progress_hook(progress_slots, slot, cancel_event):
+    """
+    Build a yt-dlp progress hook publishing file progress into a shared slot
+    Args:
+        progress_slots: Shared list polled by the GUI
+        slot (int): Index of the slot this hook writes to
+        cancel_event: Threading event for cancellation
+    Returns:
+        function: Progress hook to register on a YoutubeDL instance
+    """
+    last_elapsed = 0
+
+    def progress_hook(d):
+        """Callback function for download progress updates"""
+        nonlocal last_elapsed
+        status = d.get('status')
+        if status == 'downloading':
+            # Throttle progress updates using the elapsed time yt-dlp already tracks,
+            # a smaller value than last time means a new file has started
+            elapsed = d.get('elapsed')
+            if elapsed is None:
+                elapsed = time.monotonic()
+            if 0 <= elapsed - last_elapsed < 0.1:
+                return
+            last_elapsed = elapsed
+
+            # Cancellation is checked at the throttled rate, retry loops check it too
+            if cancel_event.is_set():
+                raise DownloadCancelled()
+            
+            # Use the percentage yt-dlp computed for its own progress line
+            percent = d.get('_percent')
+            if percent is not None:
+                file_progress = int(percent)
+            else:
+                downloaded_bytes = d.get('downloaded_bytes', 0)
+                total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 1)
+                file_progress = int((downloaded_bytes / total_bytes) * 100) if total_bytes else 0
+            
+            progress_slots[slot] = min(file_progress, 100)  # Size estimates can overshoot
+        elif status == 'finished':
+            progress_slots[slot] = 100
+
+    return progress_hook
+
+def make_postprocessor_hook(cancel_event):
+    """
+    Build a yt-dlp postprocessor hook that skips conversions once cancelled
+    Args:
+        cancel_event: Threading event for cancellation
+    Returns:
+        function: Postprocessor hook to register on a YoutubeDL instance
+    """
+    def postprocessor_hook(d):
+        """Abort before an ffmpeg step starts, progress hooks don't run during it"""
+        if d.get('status') == 'started' and cancel_event.is_set():
+            raise DownloadCancelled()
+
+    return postprocessor_hook
+
+def download_process(queue, playlist_info, format_choice, cancel_event, base_folder, progress_slots):
     """
     Sequential download process for playlist items
     Args:
-        queue: Multiprocessing queue for GUI communication
+        queue: Message queue for GUI communication
         playlist_info: Playlist metadata dictionary
         format_choice: 'mp4' or 'mp3'
-        cancel_event: Multiprocessing event for cancellation
+        cancel_event: Threading event for cancellation
         base_folder: Root download directory
+        progress_slots: Shared list the GUI polls for current file progress
     """
+    ydl = None
+    pp_executor = None
     try:
-        queue.put(("-STATUS-", "Starting downloads"))
+        queue.put(("-STATUS-", (STATUS_INFO, "Starting downloads")))
         entries = playlist_info.get('entries', [])
         total_files = len(entries)
         if total_files == 0:
-            queue.put(("-STATUS-", "Empty content"))
+            queue.put(("-STATUS-", (STATUS_INFO, "Empty content")))
             return
 
         # Create unique playlist folder
-        playlist_folder = os.path.join(base_folder, playlist_info['title'])
-        suffix = 1
-        original_folder = playlist_folder
-        while os.path.exists(playlist_folder):
-            playlist_folder = f"{original_folder}_{suffix}"
-            suffix += 1
-        os.makedirs(playlist_folder)
+        playlist_folder = create_playlist_folder(base_folder, playlist_info['title'])
+
+        # Configure download options
+        ydl_opts = build_download_opts(format_choice, playlist_folder)
+
+        # MP3 conversion is run by hand so it can overlap the next download
+        postprocessors = ydl_opts.pop('postprocessors', None)
+        convert_audio = postprocessors is not None
+
+        # One downloader instance and progress hook are reused for the whole playlist
+        ydl = yt_dlp.YoutubeDL(ydl_opts)
+        ydl.add_progress_hook(make_progress_hook(progress_slots, 0, cancel_event))
+        ydl.add_postprocessor_hook(make_postprocessor_hook(cancel_event))
+
+        if convert_audio:
+            # Build the converter from the MP3_OPTS definition so both modes stay in sync
+            pp_args = dict(postprocessors[0])
+            pp_args.pop('key')
+            audio_pp = FFmpegExtractAudioPP(ydl, **pp_args)
+            pp_executor = ThreadPoolExecutor(max_workers=1)
+
+            def postprocess(info, video_title):
+                """Convert a downloaded file to mp3 and report it as processed"""
+                try:
+                    ydl.run_pp(audio_pp, info)
+                    queue.put(("-DOWNLOADED-PROGRESS-", 1))
+                except DownloadCancelled:
+                    return
+                except Exception as e:
+                    queue.put(("-STATUS-", (STATUS_INFO, f"Conversion failed '{video_title}'")))
+                queue.put(("-PROCESSED-PROGRESS-", 1))
 
         downloaded_count = 0
         processed_count = 0
@@ -147,27 +388,10 @@ def download_process(queue, playlist_info, format_choice, cancel_event, base_fol
                 raise DownloadCancelled("Download cancelled")
             
             # Construct video metadata
-            video_id = video.get("id", "")
-            video_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else video.get("url", "")
+            video_url = get_video_url(video)
             video_title = video.get("title", "Unknown video")
 
-            queue.put(("-STATUS-", f"Downloading:  '{video_title}'"))
-
-            # Configure download options
-            ydl_opts = {
-                'ffmpeg_location': get_ffmpeg_path(),
-                'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]' if format_choice == "mp4" else 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '256',
-                }] if format_choice == "mp3" else None,
-                'outtmpl': os.path.join(playlist_folder, '%(title)s.%(ext)s'),
-                'merge_output_format': 'mp4' if format_choice == "mp4" else None
-            }
-            ydl_opts.update(COMMON_OPTS)
-            if ydl_opts['postprocessors'] is None:
-                del ydl_opts['postprocessors']
+            queue.put(("-STATUS-", (STATUS_INFO, f"Downloading:  '{video_title}'")))
 
             # Retry logic (3 attempts)
             success = False
@@ -176,54 +400,26 @@ def download_process(queue, playlist_info, format_choice, cancel_event, base_fol
                     raise DownloadCancelled()
                 
                 if attempt > 1:
-                    queue.put(("-STATUS-", f"Retrying download of '{video_title}' ({attempt}/3)"))
-                
-                last_progress_time = 0
-
-                def progress_hook(d):
-                    """Callback function for download progress updates"""
-                    nonlocal last_progress_time
-                    if cancel_event.is_set():
-                        raise DownloadCancelled()
-                    status = d.get('status')
-                    if status == 'downloading':
-                        now = time.monotonic()
-                        # Throttle progress updates
-                        if now - last_progress_time < 0.1:
-                            return
-                        last_progress_time = now
-                        
-                        # Calculate progress percentage
-                        percent = d.get('percent')
-                        if percent is not None:
-                            file_progress = int(percent)
-                        else:
-                            downloaded_bytes = d.get('downloaded_bytes', 0)
-                            total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 1)
-                            file_progress = int((downloaded_bytes / total_bytes) * 100) if total_bytes else 0
-                        
-                        queue.put(("-FILE-PROGRESS-", file_progress))
-                    elif status == 'finished':
-                        queue.put(("-FILE-PROGRESS-", 100))
-
-                ydl_opts['progress_hooks'] = [progress_hook]
+                    queue.put(("-STATUS-", (STATUS_INFO, f"Retrying download of '{video_title}' ({attempt}/3)")))
                 
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([video_url])
+                    info = ydl.extract_info(video_url)
                     success = True
                     if attempt > 1:
-                        queue.put(("-STATUS-", f"Successfully downloaded '{video_title}'"))
-                        time.sleep(3)
-                        queue.put(("-STATUS-", "Processing downloads"))
+                        queue.put(("-STATUS-TRANSIENT-", (f"Successfully downloaded '{video_title}'", 3.0)))
                     break
+                except DownloadCancelled:
+                    raise
                 except Exception as e:
                     if attempt == 3:
-                        queue.put(("-STATUS-", f"Download failed '{video_title}'"))
-                        time.sleep(3)
-                        queue.put(("-STATUS-", "Processing downloads"))
+                        queue.put(("-STATUS-TRANSIENT-", (f"Download failed '{video_title}'", 3.0)))
                     continue
 
+            # Converted files are counted by the postprocessing thread
+            if success and convert_audio:
+                pp_executor.submit(postprocess, info['requested_downloads'][0], video_title)
+                continue
+
             # Update progress counters
             processed_count += 1
             queue.put(("-PROCESSED-PROGRESS-", 1))
@@ -232,110 +428,134 @@ def download_process(queue, playlist_info, format_choice, cancel_event, base_fol
                 downloaded_count += 1
                 queue.put(("-DOWNLOADED-PROGRESS-", 1))
 
-        queue.put(("-STATUS-", "Completed!"))
-        queue.put(("-QUEUE-COMPLETE-", playlist_info))
+        # Wait for pending conversions before reporting completion
+        if pp_executor:
+            queue.put(("-STATUS-", (STATUS_INFO, "Converting remaining files")))
+            pp_executor.shutdown(wait=True)
+
+        queue.put(("-STATUS-", (STATUS_DONE, "Completed!")))
+        queue.put(("-QUEUE-COMPLETE-", playlist_info['url']))
+    except DownloadCancelled:
+        queue.put(("-STATUS-", (STATUS_CANCEL, "Cancelled")))
     except Exception as e:
-        queue.put(("-STATUS-", f"Error: {str(e)}"))
+        queue.put(("-STATUS-", (STATUS_ERROR, f"Error: {str(e)}")))
     finally:
+        if pp_executor:
+            pp_executor.shutdown(wait=True, cancel_futures=True)
+        if ydl:
+            ydl.close()
         queue.put(("-THREAD-END-", None))
 
-def download_process_concurrent(queue, playlist_info, format_choice, cancel_event, max_simultaneous, base_folder):
+def download_process_concurrent(queue, playlists, format_choice, cancel_event, max_simultaneous, base_folder, progress_slots):
     """
-    Concurrent download process using ThreadPoolExecutor
+    Concurrent download process using the shared download pool
     Args:
-        max_simultaneous: Maximum parallel downloads
+        playlists: Playlist metadata dictionaries downloaded together as one batch
+        max_simultaneous: Maximum parallel downloads (at most MAX_CONCURRENT)
+        progress_slots: Shared list with one progress slot per worker thread
         Other args same as download_process
     """
     try:
-        queue.put(("-STATUS-", "Starting downloads"))
-        entries = playlist_info.get('entries', [])
-        total_files = len(entries)
-        if total_files == 0:
-            queue.put(("-STATUS-", "Empty content"))
+        queue.put(("-STATUS-", (STATUS_INFO, "Starting downloads")))
+        playlists = [playlist for playlist in playlists if playlist.get('entries')]
+        if not playlists:
+            queue.put(("-STATUS-", (STATUS_INFO, "Empty content")))
             return
 
-        # Create unique playlist folder (same as sequential)
-        playlist_folder = os.path.join(base_folder, playlist_info['title'])
-        suffix = 1
-        original_folder = playlist_folder
-        while os.path.exists(playlist_folder):
-            playlist_folder = f"{original_folder}_{suffix}"
-            suffix += 1
-        os.makedirs(playlist_folder)
-
-        # Configure base download options
-        ydl_opts_template = {
-            'ffmpeg_location': get_ffmpeg_path(),
-            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]' if format_choice == "mp4" else 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '256',
-            }] if format_choice == "mp3" else None,
-            'outtmpl': os.path.join(playlist_folder, '%(title)s.%(ext)s'),
-            'merge_output_format': 'mp4' if format_choice == "mp4" else None
-        }
-        ydl_opts_template.update(COMMON_OPTS)
-        if ydl_opts_template['postprocessors'] is None:
-            del ydl_opts_template['postprocessors']
+        # Create unique playlist folders (same as sequential) and their download options,
+        # a playlist whose folder can't be created fails alone like its own sequential job would
+        ready = []
+        playlist_opts = []
+        for playlist in playlists:
+            try:
+                playlist_folder = create_playlist_folder(base_folder, playlist['title'])
+            except Exception as e:
+                queue.put(("-STATUS-", (STATUS_ERROR, f"Error: {str(e)}")))
+                continue
+            ready.append(playlist)
+            playlist_opts.append(build_download_opts(format_choice, playlist_folder))
+        playlists = ready
+        if not playlists:
+            return
+
+        # Entries of all playlists share the pool, each is tagged with its playlist index
+        entries = [(index, video) for index, playlist in enumerate(playlists) for video in playlist['entries']]
+        remaining = [len(playlist['entries']) for playlist in playlists]  # Unfinished entries per playlist
 
         downloaded_count = 0
         processed_count = 0
         lock = threading.Lock()  # For thread-safe counter updates
+        entries_iter = iter(entries)
+        entries_lock = threading.Lock()
+        resolved_q = Queue(maxsize=max_simultaneous)  # Entries with formats already extracted
+        download_sem = threading.BoundedSemaphore(max_simultaneous)  # Caps in-flight downloads
+        local = threading.local()  # Per worker thread progress slot and downloaders
+        slot_ids = itertools.count()
+        ydl_instances = []
+
+        def next_entry():
+            """Take the next playlist entry nobody has claimed yet"""
+            with entries_lock:
+                return next(entries_iter, None)
 
-        def download_video(video):
+        def prefetch_entries():
+            """Producer thread extracting video formats ahead of the download workers"""
+            with yt_dlp.YoutubeDL(playlist_opts[0]) as resolver:
+                while not cancel_event.is_set():
+                    entry = next_entry()
+                    if entry is None:
+                        return
+                    try:
+                        info = resolver.extract_info(get_video_url(entry[1]), download=False, process=False)
+                    except Exception as e:
+                        info = None  # The worker falls back to a full download
+                    while True:
+                        try:
+                            resolved_q.put((entry, info), timeout=0.5)
+                            break
+                        except Full:
+                            if cancel_event.is_set():
+                                return
+
+        def download_video(entry, info=None):
             """Thread worker function for individual video download"""
             nonlocal downloaded_count, processed_count
+            index, video = entry
+            slot = getattr(local, 'slot', None)
+            if slot is None:
+                slot = local.slot = next(slot_ids)
+                local.ydls = {}
+            ydl = local.ydls.get(index)
+            if ydl is None:
+                # Each worker thread keeps one downloader per playlist for the whole batch
+                ydl = local.ydls[index] = yt_dlp.YoutubeDL(playlist_opts[index])
+                ydl.add_progress_hook(make_progress_hook(progress_slots, slot, cancel_event))
+                ydl.add_postprocessor_hook(make_postprocessor_hook(cancel_event))
+                ydl_instances.append(ydl)
             video_title = video.get("title", "Unknown")
-            video_id = video.get("id", "")
-            video_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else video.get("url", "")
+            video_url = get_video_url(video)
             
             success = False
             for attempt in range(1, 4):
+                if cancel_event.is_set():
+                    raise DownloadCancelled()
+
                 try:
-                    opts = ydl_opts_template.copy()
-                    last_progress_time = 0
-
-                    def progress_hook(d):
-                        """Progress callback (same as sequential version)"""
-                        nonlocal last_progress_time
-                        if cancel_event.is_set():
-                            raise DownloadCancelled()
-                        status = d.get('status')
-                        if status == 'downloading':
-                            now = time.monotonic()
-                            if now - last_progress_time < 0.1:
-                                return
-                            last_progress_time = now
-                            
-                            percent = d.get('percent')
-                            if percent is not None:
-                                file_progress = int(percent)
-                            else:
-                                downloaded_bytes = d.get('downloaded_bytes', 0)
-                                total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 1)
-                                file_progress = int((downloaded_bytes / total_bytes) * 100) if total_bytes else 0
-                            
-                            queue.put(("-FILE-PROGRESS-", file_progress))
-                        elif status == 'finished':
-                            queue.put(("-FILE-PROGRESS-", 100))
-
-                    opts['progress_hooks'] = [progress_hook]
-                    
-                    with yt_dlp.YoutubeDL(opts) as ydl:
+                    if info is not None and attempt == 1:
+                        # Formats were extracted by the prefetch thread, only download
+                        ydl.process_ie_result(info, download=True)
+                    else:
                         ydl.download([video_url])
                     success = True
                     if attempt > 1:
-                        queue.put(("-STATUS-", f"Successfully downloaded '{video_title}'"))
-                        time.sleep(3)
-                        queue.put(("-STATUS-", "Processing downloads"))
+                        queue.put(("-STATUS-TRANSIENT-", (f"Successfully downloaded '{video_title}'", 3.0)))
                     break
+                except DownloadCancelled:
+                    raise
                 except Exception as e:
-                    queue.put(("-STATUS-", f"Retrying download of '{video_title}' ({attempt}/3)"))
+                    queue.put(("-STATUS-", (STATUS_INFO, f"Retrying download of '{video_title}' ({attempt}/3)")))
                     if attempt == 3:
-                        queue.put(("-STATUS-", f"Failed to download '{video_title}'"))
-                        time.sleep(3)
-                        queue.put(("-STATUS-", "Processing downloads"))
+                        queue.put(("-STATUS-TRANSIENT-", (f"Failed to download '{video_title}'", 3.0)))
                     continue
 
             # Update counters with thread lock
@@ -345,22 +565,70 @@ def download_process_concurrent(queue, playlist_info, format_choice, cancel_even
                 if success:
                     downloaded_count += 1
                     queue.put(("-DOWNLOADED-PROGRESS-", 1))
+                
+                # Report each playlist as soon as its last entry is done
+                remaining[index] -= 1
+                if remaining[index] == 0 and not cancel_event.is_set():
+                    queue.put(("-QUEUE-COMPLETE-", playlists[index]['url']))
             
             return success
 
-        # Create thread pool and execute downloads
-        with ThreadPoolExecutor(max_workers=max_simultaneous) as executor:
-            futures = [executor.submit(download_video, video) for video in entries]
-            for future in as_completed(futures):
-                future.result()
+        def limited_download():
+            """Wait for a free download slot, then download the next entry"""
+            with download_sem:
+                try:
+                    entry, info = resolved_q.get_nowait()
+                except Empty:
+                    # Nothing prefetched yet, extract and download directly
+                    entry, info = next_entry(), None
+                    while entry is None:
+                        # Remaining entries are held by the prefetch thread
+                        try:
+                            entry, info = resolved_q.get(timeout=0.5)
+                        except Empty:
+                            if cancel_event.is_set():
+                                raise DownloadCancelled()
+                return download_video(entry, info)
+
+        def report_error(future):
+            """Surface unexpected worker exceptions to the GUI"""
+            error = future.exception()
+            if error is not None and not isinstance(error, DownloadCancelled):
+                queue.put(("-STATUS-", (STATUS_ERROR, f"Error: {str(error)}")))
+
+        threading.Thread(target=prefetch_entries, daemon=True).start()
+
+        # Run downloads on the shared pool, the semaphore limits actual concurrency
+        try:
+            futures = [_download_pool.submit(limited_download) for _ in entries]
+            for future in futures:
+                future.add_done_callback(report_error)
+            wait(futures)
+        finally:
+            for ydl in ydl_instances:
+                ydl.close()
 
-        queue.put(("-STATUS-", "Complete!"))
-        queue.put(("-QUEUE-COMPLETE-", playlist_info))
+        if cancel_event.is_set():
+            raise DownloadCancelled()
+
+        queue.put(("-STATUS-", (STATUS_DONE, "Complete!")))
+    except DownloadCancelled:
+        queue.put(("-STATUS-", (STATUS_CANCEL, "Cancelled")))
     except Exception as e:
-        queue.put(("-STATUS-", f"Error: {str(e)}"))
+        queue.put(("-STATUS-", (STATUS_ERROR, f"Error: {str(e)}")))
     finally:
         queue.put(("-THREAD-END-", None))
 
+def download_worker(send_q):
+    """
+    Long-lived worker running queued download jobs until a 'STOP' sentinel
+    
+    Args:
+        send_q: Job queue of (target, args) tuples
+    """
+    for target, args in iter(send_q.get, 'STOP'):
+        target(*args)
+
 # Base64 encoded folder icon for GUI
 folder_icon = b"iVBORw0KGgoAAAANSUhEUgAAABQAAAAUCAYAAACNiR0NAAAACXBIWXMAAAsSAAALEgHS3X78AAAAAXNSR0IArs4c6QAAAWhJREFUOE+t1E1LVVEUxvGf9DJKIalvEEFfQHAq9g0aR6PESY0jE4UaCUoQNA2cSlAEok60QYOKhAZOA8VBgkhvlGYv+7ncC5fLrXvuwQ0HDues9d9rr+fZa8AJrwGcxnmcamP/xicc9rtfgDcxijNtycd4jyVs9wMNcA8XuyQdYKFU/xCfq0ID/POf4B0s4sM/YrLRBj62/vcC9iosvX6KG/iW4G7AH0hg1bXe1GG3E/gFy3iLn1VpSFtW8LUT+Kx8mMFlXGlW3we3Idzz1pGj9J2mH29juAYwVlsL8Bde4FEx+X2M9FNWR+ybAPdLz+5iCFMYrAmMkLMBvixV3ivKTpf3sZqwpG3hWoATzWPnVpyrCUzbIuh8gJfwGOM1YUnbLLdlEq8DvI4nNVRt7f+9DJYHmMNRgKu4WrO6CPEKsdq7lrFvdRlfVfmZmbFcnsbtSoVniwcvdAzYqsAM4NguojRWgCe6/gKcAEphpwhP9gAAAABJRU5ErkJggg=="
 
@@ -368,27 +636,8 @@ def main():
     """Main function to create and manage the GUI"""
     sg.theme("Black")
 
-    # Initialize configuration file
-    if not os.path.exists(CONFIG_PATH):
-        os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-        default_base_folder = os.path.join(os.path.expanduser("~"), "Desktop", "Petice Downloads")
-        default_create_subfolder = True
-        with open(CONFIG_PATH, 'w') as f:
-            f.write(f"{default_base_folder}\n{default_create_subfolder}\n")
-    
     # Load configuration
-    create_subfolder = True
-    base_folder = os.path.join(os.path.expanduser("~"), "Desktop")
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, 'r') as f:
-                lines = f.read().splitlines()
-                if len(lines) >= 1:
-                    base_folder = lines[0].strip()
-                if len(lines) >= 2:
-                    create_subfolder = lines[1].strip().lower() == 'true'
-        except Exception as e:
-            pass
+    base_folder, create_subfolder = load_config()
 
     # GUI layout definition
     layout = [
@@ -398,9 +647,9 @@ def main():
         [sg.Text("Format:", size=(28,1)),
          sg.Radio("MP4 (Video)", "FORMAT", key="-MP4-", default=True),
          sg.Radio("MP3 (Audio)", "FORMAT", key="-MP3-")],
-        [sg.Text("", size=(23,1)), sg.Checkbox("Concurrent Downloads", key="-CONCURRENT-", tooltip="Enable concurrent downloads (default: 10)", enable_events=True),
+        [sg.Text("", size=(23,1)), sg.Checkbox("Concurrent Downloads", key="-CONCURRENT-", tooltip=f"Enable concurrent downloads (default: {DEFAULT_CONCURRENT})", enable_events=True),
          sg.Text("Max:", tooltip="Adjust based on system resources and internet speed", key="-MAX-TEXT-"), 
-         sg.Input("10", key="-CONCURRENT-COUNT-", size=(5,1), tooltip="Adjust based on system resources and internet speed", disabled_readonly_background_color="#878585", enable_events=True)],
+         sg.Input(str(DEFAULT_CONCURRENT), key="-CONCURRENT-COUNT-", size=(5,1), tooltip=f"Adjust based on system resources and internet speed (max {MAX_CONCURRENT})", disabled_readonly_background_color="#878585", enable_events=True)],
         [sg.Text("Status:", size=(15,1)), sg.Text("Waiting for start", key="-STATUS-TXT-", expand_x=True, text_color="white")],
         [sg.Text("Current Progress:", size=(15,1), key="-CURRENT-PROGRESS-LABEL-"), 
          sg.ProgressBar(100, orientation="h", size=(38,20), key="-FILE-PROGRESS-BAR-", expand_x=False),
@@ -425,6 +674,16 @@ def main():
 
     # Create main window
     window = sg.Window("Petice Downloader", layout, resizable=False, finalize=True, size=(630, 295), icon="icon.ico")
+
+    # Elements updated on every frame or message, looked up once
+    file_bar = window["-FILE-PROGRESS-BAR-"]
+    file_txt = window["-FILE-PROGRESS-TXT-"]
+    overall_bar = window["-OVERALL-PROGRESS-BAR-"]
+    overall_txt = window["-OVERALL-PROGRESS-TXT-"]
+    count_txt = window["-SONG-COUNT-TXT-"]
+    status_txt = window["-STATUS-TXT-"]
+    cancel_btn = window["-CANCEL-"]
+    exit_btn = window["-EXIT-"]
     
     # Application state variables
     download_queue = []
@@ -432,13 +691,26 @@ def main():
     downloaded_files = 0
     processed_files = 0
     session_active = False
-    current_download = None
+    in_flight = deque()  # Jobs (lists of playlists) handed to the worker, in the order it runs them
     concurrent_mode = False
-    msg_queue = multiprocessing.Queue()
-    cancel_event = multiprocessing.Event()
-    download_proc = None
+    max_workers = DEFAULT_CONCURRENT  # Parsed value of the Max field
+    msg_queue = SimpleQueue()
+    send_q = SimpleQueue()  # Download jobs for the persistent worker
+    cancel_event = threading.Event()
+    progress_slots = [0]
     current_total = 0
     processed_current = 0
+    status_revert_at = 0  # Monotonic deadline for reverting a transient status
+    deferred_status = None  # Latest status received while a transient one is shown
+    loading_playlists = []  # Queue items still loading when the session started
+    followup_playlists = None  # Playlists that finished loading during the last session
+    last_draw = 0  # Monotonic time of the last file progress redraw
+    drawn_progress = 0  # File progress value currently shown
+
+    def show_status(status):
+        """Update status text with the color of its status code"""
+        code, status_text = status
+        status_txt.update(status_text, text_color=STATUS_COLORS[code])
 
     def update_queue_display():
         """Update the queue display text with truncated titles"""
@@ -448,49 +720,51 @@ def main():
 
     def update_counters():
         """Update progress bars and counters"""
-        nonlocal initial_total
+        nonlocal initial_total, drawn_progress
         if not session_active:
             initial_total = sum(item.get('total', 0) for item in download_queue)
         
-        window["-SONG-COUNT-TXT-"].update(" " * 22 + f"Downloaded Files: {downloaded_files} / {initial_total}")
+        count_txt.update(" " * 22 + f"Downloaded Files: {downloaded_files} / {initial_total}")
         
         if initial_total > 0:
-            progress = int((processed_files / initial_total) * 100)
-            window["-OVERALL-PROGRESS-BAR-"].update_bar(progress)
-            window["-OVERALL-PROGRESS-TXT-"].update(f"{progress}%")
+            progress = min(processed_files * 100 // initial_total, 100)
+            overall_bar.update_bar(progress)
+            overall_txt.update(PERCENT_LABELS[progress])
         
         if session_active and concurrent_mode:
-            percent = int((processed_current / current_total) * 100) if current_total > 0 else 0
-            window["-FILE-PROGRESS-BAR-"].update_bar(percent)
-            window["-FILE-PROGRESS-TXT-"].update(f"{percent}%")
+            percent = processed_current * 100 // current_total if current_total > 0 else 0
+            if percent != drawn_progress:
+                drawn_progress = percent
+                file_bar.update_bar(percent)
+                file_txt.update(PERCENT_LABELS[percent])
 
     def add_to_queue(url):
         """Add a new URL to the download queue"""
         if not url.startswith(('http://', 'https://')):
-            window["-STATUS-TXT-"].update("Invalid URL", text_color="red")
+            status_txt.update("Invalid URL", text_color="red")
             return
             
         temp_item = {'url': url, 'title': 'Loading...', 'total': 0, 'entries': []}
         download_queue.append(temp_item)
         update_queue_display()
-        window["-STATUS-TXT-"].update("Fetching info...", text_color="#5DE2E7")
+        status_txt.update("Fetching info...", text_color="#5DE2E7")
         
-        def fetch_title():
-            """Background thread for fetching playlist metadata"""
-            info = get_playlist_info(url)
+        def fetch_done(future):
+            """Pool callback applying the fetched playlist metadata"""
+            info = future.result()
             temp_item.update(info)
             
             if info['total'] == 0:
                 download_queue.remove(temp_item)
-                window["-STATUS-TXT-"].update("Invalid URL", text_color="red")
+                status_txt.update("Invalid URL", text_color="red")
                 update_queue_display()
                 return
                 
             update_queue_display()
             update_counters()
-            window["-STATUS-TXT-"].update("Waiting to start", text_color="white")
+            status_txt.update("Waiting to start", text_color="white")
         
-        threading.Thread(target=fetch_title, daemon=True).start()
+        _info_pool.submit(get_playlist_info, url).add_done_callback(fetch_done)
 
     def update_buttons(state):
         """Enable/disable GUI controls during downloads"""
@@ -506,23 +780,119 @@ def main():
         text_color = '#878585' if state else 'white'
         window["-MAX-TEXT-"].update(text_color=text_color)
 
+    def submit_sequential(job, format_choice):
+        """Queue a sequential download of the job's single playlist for the worker"""
+        send_q.put((download_process, (msg_queue, job[0], format_choice, cancel_event, base_folder, progress_slots)))
+
+    def submit_concurrent(job, format_choice):
+        """Queue a concurrent download of all playlists in the job for the worker"""
+        send_q.put((download_process_concurrent, (msg_queue, list(job), format_choice, cancel_event, max_workers, base_folder, progress_slots)))
+
+    # Indexed by concurrent_mode
+    submit_download = (submit_sequential, submit_concurrent)
+
+    # Start the download worker once, jobs are handed over through send_q
+    download_thread = threading.Thread(target=download_worker, args=(send_q,), daemon=True, name='petice-worker')
+    download_thread.start()
+
     # Main event loop
     while True:
-        event, values = window.read(timeout=100)
-
-        # Process messages from download threads
-        while not msg_queue.empty():
-            msg_type, msg_value = msg_queue.get()
-            if msg_type == "-DOWNLOADED-PROGRESS-":
-                downloaded_files += 1
-            elif msg_type == "-PROCESSED-PROGRESS-":
-                processed_files += 1
-                if concurrent_mode:
-                    processed_current += 1
-            else:
-                window.write_event_value(msg_type, msg_value)
+        event, values = window.read(timeout=33)
+
+        # Handle all pending messages from download threads in one batch, in the order they were sent
+        drained = False
+        try:
+            while True:
+                msg_type, msg_value = msg_queue.get_nowait()
+                drained = True
+                if msg_type == "-DOWNLOADED-PROGRESS-":
+                    downloaded_files += 1
+
+                elif msg_type == "-PROCESSED-PROGRESS-":
+                    processed_files += 1
+                    if concurrent_mode:
+                        processed_current += 1
+
+                elif msg_type == "-STATUS-":
+                    if status_revert_at:
+                        deferred_status = msg_value
+                    else:
+                        show_status(msg_value)
+
+                elif msg_type == "-STATUS-TRANSIENT-":
+                    # Show a status for a limited time, then fall back to the generic one
+                    status_text, duration = msg_value
+                    status_revert_at = time.monotonic() + duration
+                    show_status((STATUS_INFO, status_text))
+
+                elif msg_type == "-QUEUE-COMPLETE-":
+                    # The worker runs jobs in order, so the completed playlist belongs to the oldest job
+                    job = in_flight[0]
+                    completed = next((item for item in job if item['url'] == msg_value), None)
+                    if completed is not None:
+                        job.remove(completed)
+                        download_queue[:] = [item for item in download_queue if item is not completed]
+                        update_queue_display()
+
+                elif msg_type == "-THREAD-END-":
+                    in_flight.popleft()
+
+                    # The worker moves straight on to the next job of the session
+                    if in_flight:
+                        current_total = sum(item['total'] for item in in_flight[0])
+                        processed_current = 0
+                        progress_slots[:] = [0] * len(progress_slots)
+                        file_bar.update_bar(0)
+                        file_txt.update("0%")
+                        drawn_progress = 0
+                        continue
+
+                    # Cleanup after the last job of the session, the final counts stay on screen
+                    update_counters()
+                    drained = False
+                    cancel_btn.update(visible=False)
+                    exit_btn.update(visible=True)
+                    update_buttons(False)
+
+                    session_active = False
+
+                    # Playlists still loading when the session started were not dispatched,
+                    # failed ones stay in the queue for the next Download press
+                    pending = [item for item in loading_playlists
+                               if item['total'] > 0 and any(item is queued for queued in download_queue)]
+
+                    if cancel_event.is_set():
+                        status_txt.update("Cancelled", text_color="red")
+                        downloaded_files = 0
+                        processed_files = 0
+                        update_counters()
+
+                    # Start a new session for playlists that finished loading meanwhile
+                    elif pending:
+                        followup_playlists = pending
+                        window.write_event_value("-DOWNLOAD-", None)
+        except Empty:
+            pass
+        if drained:
             update_counters()
 
+        # Revert transient status messages once they expire
+        if status_revert_at and time.monotonic() >= status_revert_at:
+            status_revert_at = 0
+            show_status(deferred_status or (STATUS_INFO, "Processing downloads"))
+            deferred_status = None
+
+        # Poll file progress written by download threads, redrawing at most ~30 times per second
+        if session_active and not (concurrent_mode and current_total != 1):
+            now = time.monotonic()
+            if now - last_draw >= 0.033:
+                last_draw = now
+                file_progress = max(progress_slots)
+                if file_progress != drawn_progress:
+                    drawn_progress = file_progress
+                    file_bar.update_bar(file_progress)
+                    file_txt.update(PERCENT_LABELS[file_progress])
+
         # Handle window events
         if event in (sg.WIN_CLOSED, "-EXIT-"):
             break
@@ -535,11 +905,11 @@ def main():
                 downloaded_files = 0
                 processed_files = 0
                 initial_total = sum(item.get('total', 0) for item in download_queue)
-                window["-FILE-PROGRESS-BAR-"].update_bar(0)
-                window["-FILE-PROGRESS-TXT-"].update("0%")
-                window["-OVERALL-PROGRESS-BAR-"].update_bar(0)
-                window["-OVERALL-PROGRESS-TXT-"].update("0%")
-                window["-SONG-COUNT-TXT-"].update(" " * 22 + f"Downloaded Files: 0 / {initial_total}")
+                file_bar.update_bar(0)
+                file_txt.update("0%")
+                overall_bar.update_bar(0)
+                overall_txt.update("0%")
+                count_txt.update(" " * 22 + f"Downloaded Files: 0 / {initial_total}")
 
         elif event == "-CLEAR-QUEUE-":
             download_queue = []
@@ -591,6 +961,11 @@ def main():
         elif event == "-CONCURRENT-":
             concurrent_mode = values["-CONCURRENT-"]
 
+        elif event == "-CONCURRENT-COUNT-":
+            # Parse the Max field when it changes rather than on every download start
+            max_workers = int(values["-CONCURRENT-COUNT-"]) if values["-CONCURRENT-COUNT-"].isdigit() else DEFAULT_CONCURRENT
+            max_workers = min(max(max_workers, 1), MAX_CONCURRENT)
+
         elif event == "-CHOOSE-DIR-":
             # Directory selection dialog
             layout_folder = [
@@ -622,8 +997,7 @@ def main():
                     base_folder = new_base
                     
                     # Save new configuration
-                    with open(CONFIG_PATH, 'w') as f:
-                        f.write(f"{base_folder}\n{str(create_subfolder).lower()}")
+                    save_config(base_folder, create_subfolder)
                         
                     sg.popup(f"Directory updated:\n{base_folder}\n\nThis location will be remembered.", title="Settings saved", icon="icon.ico")
                 except Exception as e:
@@ -632,96 +1006,88 @@ def main():
             window_folder.close()
 
         elif event == "-DOWNLOAD-":
-            if download_queue and not current_download and initial_total > 0:
-                session_active = True
-                current_download = download_queue[-1]
-                current_total = current_download.get('total', 0)
-                processed_current = 0
-
-                update_buttons(True)
+            # A follow-up session only takes the playlists that finished loading during the last one
+            followup = followup_playlists is not None
+            candidates = followup_playlists if followup else reversed(download_queue)
+            followup_playlists = None
+            playlists = [item for item in candidates if item['total'] > 0]
 
-                # Initialize UI elements
-                window["-STATUS-TXT-"].update("Starting...", text_color="yellow")
-                window["-FILE-PROGRESS-BAR-"].update_bar(0)
-                window["-FILE-PROGRESS-TXT-"].update("0%")
-                window["-EXIT-"].update(visible=False)
-                window["-CANCEL-"].update(visible=True)
+            if playlists and not session_active:
+                session_active = True
                 cancel_event.clear()
+                if followup:
+                    # Keep counting on top of the finished session
+                    initial_total += sum(item['total'] for item in playlists)
                 
-                # Start download process
+                # Download options are shared by every playlist of the session
                 format_choice = "mp4" if values["-MP4-"] else "mp3"
                 
                 if concurrent_mode:
-                    max_workers = int(values["-CONCURRENT-COUNT-"]) if values["-CONCURRENT-COUNT-"].isdigit() else 10
-                    target = download_process_concurrent
-                    args = (msg_queue, current_download, format_choice, cancel_event, max_workers, base_folder)
+                    progress_slots = [0] * MAX_CONCURRENT
                 else:
-                    target = download_process
-                    args = (msg_queue, current_download, format_choice, cancel_event, base_folder)
+                    progress_slots = [0]
+                
+                loading_playlists = [item for item in reversed(download_queue) if item['total'] == 0]
                 
-                download_proc = multiprocessing.Process(target=target, args=args)
-                download_proc.start()
+                # Hand all loaded playlists to the worker at once, one job each,
+                # or a single job in concurrent mode so they share the download pool
+                for job in ([playlists] if concurrent_mode else [[item] for item in playlists]):
+                    in_flight.append(job)
+                    submit_download[concurrent_mode](job, format_choice)
+                
+                current_total = sum(item['total'] for item in in_flight[0])
+                processed_current = 0
 
-        elif event == "-CANCEL-":
-            cancel_event.set()
-            if download_proc:
-                download_proc.terminate()
-            window["-CANCEL-"].update(visible=False)
-            window["-EXIT-"].update(visible=True)
-            window["-STATUS-TXT-"].update("Cancelled", text_color="red")
-            update_buttons(False)
-            current_download = None
-            session_active = False
-            downloaded_files = 0
-            processed_files = 0
-            update_counters()
+                update_buttons(True)
 
-        elif event == "-STATUS-":
-            # Update status text with color coding
-            status_text = values["-STATUS-"]
-            color = ("#7BFF47" if "Complete" in status_text 
-                    else "red" if any(x in status_text for x in ["Error", "Cancelled"]) 
-                    else "white")
-            window["-STATUS-TXT-"].update(status_text, text_color=color)
-
-        elif event == "-FILE-PROGRESS-":
-            # Update file progress bar
-            if concurrent_mode:
-                if current_total == 1:
-                    window["-FILE-PROGRESS-BAR-"].update_bar(msg_value)
-                    window["-FILE-PROGRESS-TXT-"].update(f"{msg_value}%")
-                else:
-                    percent = int((processed_current / current_total) * 100) if current_total > 0 else 0
-                    window["-FILE-PROGRESS-BAR-"].update_bar(percent)
-                    window["-FILE-PROGRESS-TXT-"].update(f"{percent}%")
-            else:
-                window["-FILE-PROGRESS-BAR-"].update_bar(msg_value)
-                window["-FILE-PROGRESS-TXT-"].update(f"{msg_value}%")
+                # Initialize UI elements
+                status_txt.update("Starting...", text_color="yellow")
+                file_bar.update_bar(0)
+                file_txt.update("0%")
+                drawn_progress = 0
+                exit_btn.update(visible=False)
+                cancel_btn.update(visible=True, disabled=False)
 
-        elif event == "-QUEUE-COMPLETE-":
-            if download_queue and current_download == download_queue[-1]:
-                download_queue.pop()
-                current_download = None
-                update_queue_display()
-                
-        elif event == "-THREAD-END-":
-            # Cleanup after download completion
-            window["-CANCEL-"].update(visible=False)
-            window["-EXIT-"].update(visible=True)
-            update_buttons(False)
-
-            current_download = None
-            session_active = False
+        elif event == "-CANCEL-":
+            # Workers stop cooperatively, cleanup happens on their -THREAD-END- message
+            cancel_event.set()
+            
+            # Drop playlists the worker hasn't started yet
+            try:
+                while True:
+                    send_q.get_nowait()
+                    in_flight.pop()
+            except Empty:
+                pass
             
-            # Start next download if queue not empty
-            if download_queue and not current_download:
-                window.write_event_value("-DOWNLOAD-", None)
+            status_revert_at = 0
+            deferred_status = None
+            cancel_btn.update(disabled=True)
+            status_txt.update("Cancelling...", text_color="red")
 
-    # Cleanup before exit
-    if download_proc and download_proc.is_alive():
-        download_proc.terminate()
+    # Cleanup before exit, drop pending jobs and give the current one time to wind down
+    cancel_event.set()
+    try:
+        while True:
+            send_q.get_nowait()
+    except Empty:
+        pass
+    send_q.put('STOP')
     window.close()
 
+    # Pool threads aren't daemons and would be joined at interpreter exit, so a long
+    # ffmpeg step could keep the process alive after the window is gone. Give running
+    # work 2 seconds to stop, then exit without waiting for it
+    _info_pool.shutdown(wait=False, cancel_futures=True)
+    _download_pool.shutdown(wait=False, cancel_futures=True)
+    deadline = time.monotonic() + 2
+    current = threading.current_thread()
+    busy = [thread for thread in threading.enumerate()
+            if thread is not current and (thread is download_thread or not thread.daemon)]
+    for thread in busy:
+        thread.join(timeout=max(deadline - time.monotonic(), 0))
+    if any(thread.is_alive() for thread in busy):
+        os._exit(0)
+
 if __name__ == '__main__':
-    multiprocessing.freeze_support()  # For pyinstaller compatibility
     main()